@@ -1,5 +1,5 @@
 import sqlite3
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 import os
 import logging
 
@@ -8,6 +8,8 @@ logger = logging.getLogger(__name__)
 class DatabaseManager:
     def __init__(self, db_path: str = "router_commands.db"):
         self.db_path = db_path
+        # Called with (source vendor, target vendor, source command, target command) after each new mapping
+        self._mapping_listeners: List[Callable[[str, str, str, str], None]] = []
         self._init_db()
     
     def _init_db(self) -> None:
@@ -104,6 +106,17 @@ class DatabaseManager:
         except Exception as e:
             logger.error(f"Error adding command mapping: {str(e)}")
             raise
+        
+        # The mapping is already stored, so a failing listener must not surface as a failed write
+        for listener in self._mapping_listeners:
+            try:
+                listener(source_vendor, target_vendor, source_command, target_command)
+            except Exception as e:
+                logger.error(f"Error notifying mapping listener: {str(e)}")
+    
+    def add_mapping_listener(self, listener: Callable[[str, str, str, str], None]) -> None:
+        """Register a callback invoked after each new command mapping is added"""
+        self._mapping_listeners.append(listener)
     
     def get_command_mapping(self,
                           source_vendor: str,
@@ -127,63 +140,137 @@ class DatabaseManager:
             logger.error(f"Error getting command mapping: {str(e)}")
             raise
     
+    def iter_command_mappings(self, source_vendor: str) -> Iterator[Tuple[str, str, str]]:
+        """Stream unique (target vendor, source command, target command) mappings from a vendor"""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            cursor = conn.execute("""
+                SELECT DISTINCT tv.name, cm.source_command, cm.target_command
+                FROM command_mappings cm
+                JOIN vendors sv ON cm.source_vendor_id = sv.id
+                JOIN vendors tv ON cm.target_vendor_id = tv.id
+                WHERE sv.name = ?
+            """, (source_vendor,))
+            for row in cursor:
+                yield row
+        except Exception as e:
+            logger.error(f"Error iterating command mappings: {str(e)}")
+            raise
+        finally:
+            conn.close()
+
+    def iter_commands_by_topic(self,
+                               topic: str,
+                               after_id: Optional[int] = None,
+                               limit: Optional[int] = None) -> Iterator[Tuple[int, str, str, str, str]]:
+        """Stream (id, source vendor, target vendor, source command, target command) rows for a topic.
+
+        Rows are ordered by mapping id; pass the last id seen as after_id to resume.
+        """
+        conn = sqlite3.connect(self.db_path)
+        try:
+            cursor = conn.execute("""
+                SELECT cm.id, sv.name, tv.name, cm.source_command, cm.target_command
+                FROM command_mappings cm
+                JOIN vendors sv ON cm.source_vendor_id = sv.id
+                JOIN vendors tv ON cm.target_vendor_id = tv.id
+                JOIN topics t ON cm.topic_id = t.id
+                WHERE t.name = ? AND cm.id > ?
+                ORDER BY cm.id
+                LIMIT ?
+            """, (topic, after_id if after_id is not None else 0, limit if limit is not None else -1))
+            for row in cursor:
+                yield row
+        except Exception as e:
+            logger.error(f"Error iterating commands by topic: {str(e)}")
+            raise
+        finally:
+            conn.close()
+
+    def get_commands_by_topic_page(self,
+                                   topic: str,
+                                   limit: int,
+                                   after_id: Optional[int] = None) -> Tuple[Dict[str, List[Tuple[str, str]]], Optional[int]]:
+        """Get one page of command mappings for a topic plus the cursor for the next page"""
+        # Fetch one extra row to find out whether another page exists
+        rows = list(self.iter_commands_by_topic(topic, after_id, limit + 1))
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = rows[-1][0]
+
+        # Group commands by vendor pair
+        commands = {}
+        for _, source_vendor, target_vendor, source_cmd, target_cmd in rows:
+            commands.setdefault(f"{source_vendor}->{target_vendor}", []).append((source_cmd, target_cmd))
+        logger.debug(f"Found {len(rows)} rows for topic {topic}, next cursor {next_cursor}")
+        return commands, next_cursor
+
     def get_commands_by_topic(self, topic: str) -> Dict[str, List[Tuple[str, str]]]:
         """Get all command mappings for a specific topic"""
+        logger.debug(f"Getting commands for topic: {topic}")
+        # Group commands by vendor pair
+        commands = {}
+        for _, source_vendor, target_vendor, source_cmd, target_cmd in self.iter_commands_by_topic(topic):
+            commands.setdefault(f"{source_vendor}->{target_vendor}", []).append((source_cmd, target_cmd))
+        return commands
+
+    def iter_commands_by_vendor(self,
+                                vendor: str,
+                                term: Optional[str] = None,
+                                after: Optional[str] = None,
+                                limit: Optional[int] = None) -> Iterator[str]:
+        """Stream unique commands for a vendor in sorted order.
+
+        term filters case-insensitively by substring; pass the last command seen
+        as after to resume.
+        """
+        after = after if after is not None else ''
+        pattern = '%'
+        if term:
+            escaped = term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            pattern = f"%{escaped}%"
+        conn = sqlite3.connect(self.db_path)
         try:
-            logger.debug(f"Getting commands for topic: {topic}")
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT sv.name, tv.name, cm.source_command, cm.target_command
-                    FROM command_mappings cm
-                    JOIN vendors sv ON cm.source_vendor_id = sv.id
-                    JOIN vendors tv ON cm.target_vendor_id = tv.id
-                    JOIN topics t ON cm.topic_id = t.id
-                    WHERE t.name = ?
-                """, (topic,))
-                
-                # Group commands by vendor pair
-                commands = {}
-                rows = cursor.fetchall()
-                logger.debug(f"Found {len(rows)} rows for topic {topic}")
-                
-                for row in rows:
-                    source_vendor, target_vendor, source_cmd, target_cmd = row
-                    vendor_pair = f"{source_vendor}->{target_vendor}"
-                    if vendor_pair not in commands:
-                        commands[vendor_pair] = []
-                    commands[vendor_pair].append((source_cmd, target_cmd))
-                    logger.debug(f"Added command pair: {source_cmd} -> {target_cmd} for {vendor_pair}")
-                
-                logger.debug(f"Returning commands: {commands}")
-                return commands
+            cursor = conn.execute("""
+                SELECT source_command AS command
+                FROM command_mappings cm
+                JOIN vendors v ON cm.source_vendor_id = v.id
+                WHERE v.name = ? AND cm.source_command > ? AND cm.source_command LIKE ? ESCAPE '\\'
+                UNION
+                SELECT target_command AS command
+                FROM command_mappings cm
+                JOIN vendors v ON cm.target_vendor_id = v.id
+                WHERE v.name = ? AND cm.target_command > ? AND cm.target_command LIKE ? ESCAPE '\\'
+                ORDER BY command
+                LIMIT ?
+            """, (vendor, after, pattern, vendor, after, pattern, limit if limit is not None else -1))
+            for row in cursor:
+                yield row[0]
         except Exception as e:
-            logger.error(f"Error getting commands by topic: {str(e)}")
+            logger.error(f"Error iterating commands by vendor: {str(e)}")
             raise
+        finally:
+            conn.close()
+
+    def get_commands_by_vendor_page(self,
+                                    vendor: str,
+                                    limit: int,
+                                    after: Optional[str] = None,
+                                    term: Optional[str] = None) -> Tuple[List[str], Optional[str]]:
+        """Get one page of unique commands for a vendor plus the cursor for the next page"""
+        # Fetch one extra command to find out whether another page exists
+        commands = list(self.iter_commands_by_vendor(vendor, term, after, limit + 1))
+        next_cursor = None
+        if len(commands) > limit:
+            commands = commands[:limit]
+            next_cursor = commands[-1]
+        logger.debug(f"Found {len(commands)} commands for vendor {vendor}, next cursor {next_cursor}")
+        return commands, next_cursor
 
     def get_commands_by_vendor(self, vendor: str) -> List[str]:
         """Get all unique commands for a specific vendor"""
-        try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT DISTINCT source_command
-                    FROM command_mappings cm
-                    JOIN vendors v ON cm.source_vendor_id = v.id
-                    WHERE v.name = ?
-                    UNION
-                    SELECT DISTINCT target_command
-                    FROM command_mappings cm
-                    JOIN vendors v ON cm.target_vendor_id = v.id
-                    WHERE v.name = ?
-                """, (vendor, vendor))
-                
-                commands = [row[0] for row in cursor.fetchall()]
-                logger.debug(f"Found commands for vendor {vendor}: {commands}")
-                return commands
-        except Exception as e:
-            logger.error(f"Error getting commands by vendor: {str(e)}")
-            raise
+        return list(self.iter_commands_by_vendor(vendor))
 
     def close(self):
         """Close the database connection."""
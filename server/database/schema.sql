@@ -33,4 +33,15 @@ CREATE TABLE IF NOT EXISTS command_categories (
     description TEXT,
     topic_id INTEGER,
     FOREIGN KEY (topic_id) REFERENCES topics(id)
-); 
\ No newline at end of file
+); 
+
+-- Indexes for vendor lookups and keyset pagination
+CREATE INDEX IF NOT EXISTS idx_command_mappings_source
+    ON command_mappings (source_vendor_id, source_command);
+
+CREATE INDEX IF NOT EXISTS idx_command_mappings_target
+    ON command_mappings (target_vendor_id, target_command);
+
+-- Rows are paged by id within a topic; the rowid is implicitly part of the index
+CREATE INDEX IF NOT EXISTS idx_command_mappings_topic
+    ON command_mappings (topic_id);
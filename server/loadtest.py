@@ -0,0 +1,390 @@
+"""HTTP load generator for the command translator web app.
+
+Runs a weighted mix of routes (or a recorded request log) against a locally
+started app and prints throughput, latency percentiles and error rates as JSON.
+
+Usage:
+    python -m server.loadtest --base-url http://127.0.0.1:5000 --concurrency 16 --rate 200 --duration 30
+    python -m server.loadtest --profile profile.json
+    python -m server.loadtest --replay requests.log --speed 2
+"""
+import argparse
+import itertools
+import json
+import logging
+import math
+import random
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Default traffic mix: route name -> (weight, request template)
+DEFAULT_PROFILE = {
+    "translate": {
+        "weight": 5,
+        "method": "POST",
+        "path": "/translate",
+        "json": [
+            {"source_vendor": "Huawei", "target_vendor": "Cisco", "command": "display bgp peer"},
+            {"source_vendor": "Cisco", "target_vendor": "Juniper", "command": "show ip interface brief"},
+            {"source_vendor": "Juniper", "target_vendor": "Nokia", "command": "show ospf neighbor"},
+            {"source_vendor": "Huawei", "target_vendor": "Nokia", "command": "display unknown thing"},
+        ],
+    },
+    "suggest_commands": {
+        "weight": 3,
+        "method": "GET",
+        "path": "/suggest_commands",
+        "params": [
+            {"vendor": "Huawei", "term": "display"},
+            {"vendor": "Cisco", "term": "show"},
+            {"vendor": "Juniper", "term": "set"},
+        ],
+    },
+    "commands_by_topic": {
+        "weight": 2,
+        "method": "GET",
+        "path": "/commands/{topic}",
+        "path_args": [{"topic": t} for t in ["BGP", "OSPF", "MPLS", "SSH", "Interface", "Security"]],
+    },
+}
+
+
+class RequestSpec:
+    """A single HTTP request to issue against the app"""
+
+    def __init__(self,
+                 route: str,
+                 method: str,
+                 path: str,
+                 params: Optional[Dict[str, str]] = None,
+                 body: Optional[dict] = None,
+                 headers: Optional[Dict[str, str]] = None,
+                 offset: Optional[float] = None):
+        self.route = route
+        self.method = method.upper()
+        self.path = path
+        self.params = params or {}
+        self.body = body
+        self.headers = headers or {}
+        self.offset = offset
+
+    def build(self, base_url: str) -> urllib.request.Request:
+        """Build a urllib request for this spec"""
+        url = base_url.rstrip('/') + self.path
+        if self.params:
+            url += '?' + urllib.parse.urlencode(self.params)
+        data = None
+        headers = dict(self.headers)
+        if self.body is not None:
+            data = json.dumps(self.body).encode('utf-8')
+            headers.setdefault('Content-Type', 'application/json')
+        return urllib.request.Request(url, data=data, headers=headers, method=self.method)
+
+
+class TrafficProfile:
+    """Weighted mix of routes that generates request specs"""
+
+    def __init__(self, routes: Dict[str, dict], seed: Optional[int] = None):
+        if not routes:
+            raise ValueError("Traffic profile must define at least one route")
+        self.routes = routes
+        self.names = list(routes.keys())
+        self.weights = [float(routes[name].get('weight', 1)) for name in self.names]
+        self.random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_file(cls, path: str, seed: Optional[int] = None) -> 'TrafficProfile':
+        """Load a traffic profile from a JSON file"""
+        with open(path, 'r') as f:
+            return cls(json.load(f), seed=seed)
+
+    def next_request(self) -> RequestSpec:
+        """Pick the next request according to the route weights"""
+        with self._lock:
+            name = self.random.choices(self.names, weights=self.weights)[0]
+            route = self.routes[name]
+            path = route['path']
+            if route.get('path_args'):
+                path = path.format(**self.random.choice(route['path_args']))
+            params = self.random.choice(route['params']) if route.get('params') else None
+            body = self.random.choice(route['json']) if route.get('json') else None
+        return RequestSpec(name, route.get('method', 'GET'), path,
+                           params=params, body=body, headers=route.get('headers'))
+
+
+def load_replay_log(path: str) -> List[RequestSpec]:
+    """Load a recorded request log.
+
+    One JSON object per line with "method", "path" and optionally "route",
+    "params", "json", "headers" and "offset" (seconds since the start of the
+    recording). Blank lines and lines starting with '#' are ignored.
+    """
+    specs = []
+    with open(path, 'r') as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            try:
+                entry = json.loads(line)
+            except ValueError as e:
+                raise ValueError(f"Invalid replay entry on line {line_no}: {str(e)}")
+            specs.append(RequestSpec(
+                entry.get('route', entry['path']),
+                entry.get('method', 'GET'),
+                entry['path'],
+                params=entry.get('params'),
+                body=entry.get('json'),
+                headers=entry.get('headers'),
+                offset=entry.get('offset'),
+            ))
+    return specs
+
+
+def percentile(sorted_values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    rank = max(math.ceil(pct / 100.0 * len(sorted_values)), 1) - 1
+    return sorted_values[rank]
+
+
+class LoadStats:
+    """Thread-safe collector for per-route latency and error counts"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+        self.status_codes: Dict[str, Dict[str, int]] = {}
+        # Seconds each paced request was sent after its scheduled start
+        self.schedule_lags: List[float] = []
+
+    def record(self, route: str, latency: float, status: Optional[int], error: bool) -> None:
+        with self._lock:
+            self.latencies.setdefault(route, []).append(latency)
+            self.errors[route] = self.errors.get(route, 0) + (1 if error else 0)
+            codes = self.status_codes.setdefault(route, {})
+            key = str(status) if status is not None else 'connection_error'
+            codes[key] = codes.get(key, 0) + 1
+
+    def record_lag(self, lag: float) -> None:
+        with self._lock:
+            self.schedule_lags.append(lag)
+
+    @staticmethod
+    def _summarize(latencies: List[float], errors: int, elapsed: float) -> Dict[str, object]:
+        values = sorted(latencies)
+        count = len(values)
+        to_ms = lambda v: round(v * 1000.0, 3) if v is not None else None
+        return {
+            'requests': count,
+            'errors': errors,
+            'error_rate': round(errors / count, 4) if count else 0.0,
+            'throughput_rps': round(count / elapsed, 2) if elapsed > 0 else 0.0,
+            'latency_ms': {
+                'min': to_ms(values[0]) if values else None,
+                'mean': to_ms(sum(values) / count) if values else None,
+                'p50': to_ms(percentile(values, 50)),
+                'p95': to_ms(percentile(values, 95)),
+                'p99': to_ms(percentile(values, 99)),
+                'max': to_ms(values[-1]) if values else None,
+            },
+        }
+
+    def schedule_report(self,
+                        target_rate: Optional[float],
+                        sent: int,
+                        dispatch_elapsed: float) -> Dict[str, object]:
+        """Summarize how closely requests were sent to their schedule"""
+        with self._lock:
+            lags = sorted(self.schedule_lags)
+        to_ms = lambda v: round(v * 1000.0, 3) if v is not None else None
+        return {
+            'target_rate_rps': target_rate,
+            'achieved_rate_rps': round(sent / dispatch_elapsed, 2) if dispatch_elapsed > 0 else 0.0,
+            'paced_requests': len(lags),
+            'lag_ms': {
+                'p50': to_ms(percentile(lags, 50)),
+                'p95': to_ms(percentile(lags, 95)),
+                'p99': to_ms(percentile(lags, 99)),
+                'max': to_ms(lags[-1]) if lags else None,
+            },
+        }
+
+    def report(self, elapsed: float) -> Dict[str, object]:
+        """Build the JSON-serializable report"""
+        with self._lock:
+            all_latencies = list(itertools.chain.from_iterable(self.latencies.values()))
+            report = {'elapsed_seconds': round(elapsed, 3)}
+            report.update(self._summarize(all_latencies, sum(self.errors.values()), elapsed))
+            report['routes'] = {}
+            for route in sorted(self.latencies):
+                summary = self._summarize(self.latencies[route], self.errors[route], elapsed)
+                summary['status_codes'] = dict(self.status_codes[route])
+                report['routes'][route] = summary
+            return report
+
+
+class LoadRunner:
+    """Issues requests with bounded concurrency and an optional target rate"""
+
+    def __init__(self,
+                 base_url: str,
+                 concurrency: int = 8,
+                 rate: Optional[float] = None,
+                 timeout: float = 10.0):
+        if concurrency < 1:
+            raise ValueError("Concurrency must be at least 1")
+        if rate is not None and rate <= 0:
+            raise ValueError("Rate must be positive")
+        self.base_url = base_url
+        self.concurrency = concurrency
+        self.rate = rate
+        self.timeout = timeout
+        self.stats = LoadStats()
+
+    def _send(self, spec: RequestSpec, scheduled: Optional[float] = None) -> None:
+        """Send one request.
+
+        When the request has a scheduled start, latency is measured from that
+        start rather than from the actual send, so time spent queued behind a
+        saturated pool counts against latency instead of being omitted.
+        """
+        sent = time.perf_counter()
+        start = sent
+        if scheduled is not None:
+            start = min(scheduled, sent)
+            self.stats.record_lag(sent - start)
+        status = None
+        error = False
+        try:
+            with urllib.request.urlopen(spec.build(self.base_url), timeout=self.timeout) as response:
+                response.read()
+                status = response.status
+        except urllib.error.HTTPError as e:
+            status = e.code
+            error = True
+        except Exception as e:
+            logger.debug(f"Request to {spec.path} failed: {str(e)}")
+            error = True
+        self.stats.record(spec.route, time.perf_counter() - start, status, error)
+
+    def _run(self, schedule: Iterator[tuple]) -> Dict[str, object]:
+        """Run (start_offset, spec) pairs; offsets of None mean 'as soon as possible'"""
+        # Bounded semaphore keeps at most `concurrency` requests queued or in flight
+        slots = threading.BoundedSemaphore(self.concurrency)
+        start = time.perf_counter()
+
+        def task(spec: RequestSpec, scheduled: Optional[float]) -> None:
+            try:
+                self._send(spec, scheduled)
+            finally:
+                slots.release()
+
+        sent = 0
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            for offset, spec in schedule:
+                scheduled = None
+                if offset is not None:
+                    scheduled = start + offset
+                    delay = scheduled - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+                slots.acquire()
+                pool.submit(task, spec, scheduled)
+                sent += 1
+            dispatch_elapsed = time.perf_counter() - start
+        report = self.stats.report(time.perf_counter() - start)
+        report['schedule'] = self.stats.schedule_report(self.rate, sent, dispatch_elapsed)
+        return report
+
+    def run_profile(self,
+                    profile: TrafficProfile,
+                    duration: Optional[float] = None,
+                    total_requests: Optional[int] = None) -> Dict[str, object]:
+        """Generate traffic from a profile until the duration or request count is reached"""
+        if duration is None and total_requests is None:
+            raise ValueError("Either duration or total_requests is required")
+
+        def schedule():
+            start = time.perf_counter()
+            for i in itertools.count():
+                if total_requests is not None and i >= total_requests:
+                    return
+                offset = i / self.rate if self.rate else None
+                if duration is not None:
+                    if (offset if offset is not None else time.perf_counter() - start) >= duration:
+                        return
+                yield offset, profile.next_request()
+
+        return self._run(schedule())
+
+    def run_replay(self, specs: List[RequestSpec], speed: float = 1.0) -> Dict[str, object]:
+        """Replay recorded requests, honouring their offsets scaled by speed.
+
+        Entries without an offset are paced by the runner's rate, or sent as
+        fast as concurrency allows when no rate is set. Entries are dispatched
+        in schedule order, not file order, so an unsorted log does not count
+        the dispatcher's wait for a later entry as latency of an earlier one.
+        """
+        if speed <= 0:
+            raise ValueError("Speed must be positive")
+
+        schedule = []
+        for i, spec in enumerate(specs):
+            if spec.offset is not None:
+                schedule.append((spec.offset / speed, spec))
+            else:
+                schedule.append(((i / self.rate if self.rate else None), spec))
+        # Stable sort; unscheduled entries go first since they may be sent at once
+        schedule.sort(key=lambda entry: entry[0] if entry[0] is not None else float('-inf'))
+        return self._run(iter(schedule))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Load test the command translator web app")
+    parser.add_argument('--base-url', default='http://127.0.0.1:5000', help="Base URL of the running app")
+    parser.add_argument('--concurrency', type=int, default=8, help="Maximum concurrent requests")
+    parser.add_argument('--rate', type=float, default=None, help="Target requests per second (default: unthrottled)")
+    parser.add_argument('--duration', type=float, default=None, help="Seconds to generate traffic for")
+    parser.add_argument('--requests', type=int, default=None, help="Total number of requests to send")
+    parser.add_argument('--timeout', type=float, default=10.0, help="Per-request timeout in seconds")
+    parser.add_argument('--profile', default=None, help="JSON traffic profile (route mix); defaults to a built-in mix")
+    parser.add_argument('--replay', default=None, help="Recorded request log to replay (JSON lines)")
+    parser.add_argument('--speed', type=float, default=1.0, help="Replay speed multiplier")
+    parser.add_argument('--seed', type=int, default=None, help="Random seed for the route mix")
+    parser.add_argument('--output', default=None, help="Write the JSON report to this file")
+    args = parser.parse_args(argv)
+
+    runner = LoadRunner(args.base_url, concurrency=args.concurrency, rate=args.rate, timeout=args.timeout)
+    if args.replay:
+        report = runner.run_replay(load_replay_log(args.replay), speed=args.speed)
+    else:
+        if args.profile:
+            profile = TrafficProfile.from_file(args.profile, seed=args.seed)
+        else:
+            profile = TrafficProfile(DEFAULT_PROFILE, seed=args.seed)
+        duration = args.duration
+        if duration is None and args.requests is None:
+            duration = 10.0
+        report = runner.run_profile(profile, duration=duration, total_requests=args.requests)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    print(output)
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
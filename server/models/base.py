@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 class Vendor(ABC):
     """Base class for vendor-specific implementations"""
@@ -7,6 +7,8 @@ class Vendor(ABC):
     def __init__(self, name: str):
         self.name = name
         self.command_patterns: Dict[str, str] = {}
+        # Set by vendors backed by a database to enable nearest-match suggestions
+        self.similarity_index = None
     
     @abstractmethod
     def translate_command(self, command: str, target_vendor: 'Vendor') -> str:
@@ -17,6 +19,26 @@ class Vendor(ABC):
     def get_command_patterns(self) -> Dict[str, str]:
         """Get command patterns for this vendor"""
         pass
+    
+    def lookup_command(self, command: str, target_vendor: 'Vendor') -> Optional[str]:
+        """Look up an exact translation for a command, or None if none is known"""
+        return None
+    
+    def translate_by_pattern(self, command: str, target_vendor: 'Vendor') -> str:
+        """Translate a command using this vendor's command patterns"""
+        # This is a simplified example - in reality, you'd want more sophisticated pattern matching
+        for pattern, replacement in self.command_patterns.items():
+            if pattern in command:
+                # Replace the pattern with target vendor's equivalent
+                return command.replace(pattern, replacement)
+        
+        return f"# No translation found for command: {command}"
+    
+    def find_similar_commands(self, command: str, target_vendor: 'Vendor', k: int = 5) -> List[Tuple[str, str, float]]:
+        """Find the closest known mappings for a command without an exact translation"""
+        if self.similarity_index is None:
+            return []
+        return self.similarity_index.find_similar(command, target_vendor.name, k)
 
 class CommandTranslator:
     """Main translator class that handles command translation between vendors"""
@@ -40,6 +62,40 @@ class CommandTranslator:
             self.vendors[target_vendor]
         )
     
+    def translate_with_suggestions(self,
+                                   command: str,
+                                   source_vendor: str,
+                                   target_vendor: str,
+                                   k: int = 5) -> Tuple[str, Optional[List[Tuple[str, str, float]]]]:
+        """Translate a command, with the closest known mappings when there is no exact match.
+
+        Suggestions are None when an exact mapping was found.
+        """
+        if source_vendor not in self.vendors:
+            raise ValueError(f"Source vendor {source_vendor} not registered")
+        if target_vendor not in self.vendors:
+            raise ValueError(f"Target vendor {target_vendor} not registered")
+        
+        source = self.vendors[source_vendor]
+        target = self.vendors[target_vendor]
+        translated = source.lookup_command(command, target)
+        if translated:
+            return translated, None
+        return source.translate_by_pattern(command, target), source.find_similar_commands(command, target, k)
+    
+    def find_similar(self, command: str, source_vendor: str, target_vendor: str, k: int = 5) -> List[Tuple[str, str, float]]:
+        """Find the closest known mappings from source vendor to target vendor"""
+        if source_vendor not in self.vendors:
+            raise ValueError(f"Source vendor {source_vendor} not registered")
+        if target_vendor not in self.vendors:
+            raise ValueError(f"Target vendor {target_vendor} not registered")
+        
+        return self.vendors[source_vendor].find_similar_commands(
+            command,
+            self.vendors[target_vendor],
+            k
+        )
+    
     def get_commands_by_topic(self, topic: str) -> Dict[str, List[str]]:
         """Get commands for a specific topic across all vendors"""
         # This will be implemented to query the database
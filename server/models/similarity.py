@@ -0,0 +1,174 @@
+import heapq
+import logging
+import math
+import sys
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from server.database.db_manager import DatabaseManager
+
+logger = logging.getLogger(__name__)
+
+
+def tokenize(command: str) -> Tuple[str, ...]:
+    """Split a command into lower-cased, interned tokens"""
+    return tuple(sys.intern(token) for token in command.lower().split())
+
+
+def token_edit_distance(a: Sequence[str], b: Sequence[str]) -> int:
+    """Levenshtein distance between two token sequences"""
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, token_a in enumerate(a, 1):
+        current = [i]
+        for j, token_b in enumerate(b, 1):
+            current.append(min(
+                previous[j] + 1,  # deletion
+                current[j - 1] + 1,  # insertion
+                previous[j - 1] + (token_a is not token_b and token_a != token_b),  # substitution
+            ))
+        previous = current
+    return previous[-1]
+
+
+def similarity_score(a: Sequence[str], b: Sequence[str], distance: int) -> float:
+    """Normalize a token edit distance to a 0.0 - 1.0 similarity score"""
+    longest = max(len(a), len(b))
+    return 1.0 - distance / longest if longest else 1.0
+
+
+class TokenIndex:
+    """Inverted token index over source commands with edit-distance re-ranking.
+
+    Candidates are gathered from the postings of the query's tokens, rarest
+    first and weighted by inverse document frequency, then the best
+    candidates are re-ranked by token edit distance. Postings longer than
+    max_postings (tokens like "show" or "display") are skipped once rarer
+    tokens have produced candidates, which bounds query time on large indexes.
+    """
+
+    def __init__(self):
+        self.entries: List[Tuple[Tuple[str, ...], str, str]] = []
+        self.postings: Dict[str, List[int]] = {}
+        self._seen: Set[Tuple[str, str]] = set()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def add(self, source_command: str, target_command: str) -> None:
+        """Add a mapping; mappings already in the index are ignored"""
+        if (source_command, target_command) in self._seen:
+            return
+        self._seen.add((source_command, target_command))
+        tokens = tokenize(source_command)
+        entry_id = len(self.entries)
+        self.entries.append((tokens, source_command, target_command))
+        for token in set(tokens):
+            self.postings.setdefault(token, []).append(entry_id)
+
+    def search(self,
+               command: str,
+               k: int = 5,
+               max_candidates: int = 200,
+               max_postings: int = 20000) -> List[Tuple[str, str, float]]:
+        """Find up to k closest mappings as (source command, target command, score)"""
+        query = tokenize(command)
+        if not self.entries or not query or k < 1:
+            return []
+
+        total = len(self.entries)
+        weights: Dict[int, float] = {}
+        for token in sorted(set(query), key=lambda t: len(self.postings.get(t, ()))):
+            posting = self.postings.get(token)
+            if not posting:
+                continue
+            if len(posting) > max_postings and weights:
+                continue
+            idf = math.log(1.0 + total / len(posting))
+            for entry_id in posting[:max_postings]:
+                weights[entry_id] = weights.get(entry_id, 0.0) + idf
+
+        candidates = heapq.nlargest(max_candidates, weights.items(), key=lambda item: item[1])
+        scored = []
+        for entry_id, weight in candidates:
+            tokens, source_command, target_command = self.entries[entry_id]
+            score = similarity_score(query, tokens, token_edit_distance(query, tokens))
+            scored.append((score, weight, source_command, target_command))
+        scored.sort(key=lambda item: (-item[0], -item[1]))
+        return [(source_command, target_command, round(score, 4))
+                for score, _, source_command, target_command in scored[:k]]
+
+
+class SimilarityIndex:
+    """Token indexes over one vendor's source commands, one per target vendor.
+
+    build() loads every mapping for the vendor once, typically at application
+    startup or in a background thread; until it finishes, lookups return no
+    suggestions rather than blocking the request. Afterwards, mappings added
+    through the DatabaseManager are indexed incrementally.
+    """
+
+    def __init__(self, db_manager: DatabaseManager, source_vendor: str):
+        self.db_manager = db_manager
+        self.source_vendor = source_vendor
+        self._indexes: Dict[str, TokenIndex] = {}
+        self._built = False
+        self._lock = threading.Lock()
+        db_manager.add_mapping_listener(self._on_mapping_added)
+
+    @property
+    def ready(self) -> bool:
+        return self._built
+
+    def build(self) -> None:
+        """Index all existing mappings from this vendor"""
+        with self._lock:
+            if self._built:
+                return
+            start = time.perf_counter()
+            for target_vendor, source_command, target_command in self.db_manager.iter_command_mappings(self.source_vendor):
+                self._indexes.setdefault(target_vendor, TokenIndex()).add(source_command, target_command)
+            self._built = True
+        logger.debug(f"Built similarity index for {self.source_vendor} in {time.perf_counter() - start:.3f}s")
+
+    def _on_mapping_added(self,
+                          source_vendor: str,
+                          target_vendor: str,
+                          source_command: str,
+                          target_command: str) -> None:
+        if source_vendor != self.source_vendor:
+            return
+        with self._lock:
+            # Before build() runs, the mapping will be picked up from the database
+            if self._built:
+                self._indexes.setdefault(target_vendor, TokenIndex()).add(source_command, target_command)
+
+    def find_similar(self,
+                     command: str,
+                     target_vendor: str,
+                     k: int = 5,
+                     max_candidates: int = 200) -> List[Tuple[str, str, float]]:
+        """Find the k known mappings whose source commands are closest to command"""
+        index = self._indexes.get(target_vendor) if self._built else None
+        if index is None:
+            return []
+        return index.search(command, k, max_candidates)
+
+
+def build_similarity_indexes(indexes: Iterable[SimilarityIndex], background: bool = True) -> Optional[threading.Thread]:
+    """Build similarity indexes, by default in a daemon thread so startup is not delayed"""
+    def build_all():
+        for index in indexes:
+            try:
+                index.build()
+            except Exception as e:
+                logger.error(f"Error building similarity index for {index.source_vendor}: {str(e)}")
+
+    if not background:
+        build_all()
+        return None
+    thread = threading.Thread(target=build_all, name='similarity-index-build', daemon=True)
+    thread.start()
+    return thread
@@ -1,25 +1,28 @@
-from typing import Dict
+from typing import Dict, Optional
 from ..base import Vendor
 from ...database.db_manager import DatabaseManager
+from ..similarity import SimilarityIndex
 
 class JuniperVendor(Vendor):
     def __init__(self, db_manager: DatabaseManager):
         super().__init__("Juniper")
         self.db_manager = db_manager
         self.command_patterns = self.get_command_patterns()
+        self.similarity_index = SimilarityIndex(db_manager, self.name)
     
-    def translate_command(self, command: str, target_vendor: Vendor) -> str:
-        translated = self.db_manager.get_command_mapping(
+    def lookup_command(self, command: str, target_vendor: Vendor) -> Optional[str]:
+        return self.db_manager.get_command_mapping(
             self.name,
             target_vendor.name,
             command
         )
+    
+    def translate_command(self, command: str, target_vendor: Vendor) -> str:
+        # First try exact match, then fall back to pattern matching
+        translated = self.lookup_command(command, target_vendor)
         if translated:
             return translated
-        for pattern, replacement in self.command_patterns.items():
-            if pattern in command:
-                return command.replace(pattern, replacement)
-        return f"# No translation found for command: {command}"
+        return self.translate_by_pattern(command, target_vendor)
     
     def get_command_patterns(self) -> Dict[str, str]:
         return {
@@ -18,13 +18,22 @@ from server.models.vendors.huawei import HuaweiVendor
 from server.models.vendors.cisco import CiscoVendor
 from server.models.vendors.juniper import JuniperVendor
 from server.models.vendors.nokia import NokiaVendor
+from server.models.similarity import build_similarity_indexes
+from server.web.profiling import init_profiling
+from server.web.singleflight import SingleFlight
 
 app = Flask(__name__)
 
+# Opt-in per-request profiling, configured through PROFILE_* environment variables
+init_profiling(app)
+
 # Initialize translator and database
 db_manager = DatabaseManager()
 translator = CommandTranslator()
 
+# Coalesces identical concurrent /translate and /commands/<topic> requests
+coalescer = SingleFlight()
+
 # Register vendors
 vendors = {
     "Huawei": HuaweiVendor(db_manager),
@@ -291,6 +300,9 @@ def add_example_mappings():
 # Add example mappings
 add_example_mappings()
 
+# Precompute nearest-match indexes; new mappings are indexed incrementally afterwards
+build_similarity_indexes([vendor.similarity_index for vendor in vendors.values()])
+
 @app.route('/')
 def index():
     return render_template('index.html')
@@ -299,22 +311,42 @@ def index():
 def get_vendors():
     return jsonify({'vendors': list(vendors.keys())})
 
+# Number of nearest-match suggestions returned for untranslated commands
+SUGGESTION_COUNT = 5
+
 @app.route('/translate', methods=['POST'])
 def translate_command():
     data = request.get_json()
     source_vendor = data.get('source_vendor')
     target_vendor = data.get('target_vendor')
     command = data.get('command')
+    # Collapse surrounding and repeated whitespace so equivalent commands share
+    # one lookup and one coalescing key
+    if isinstance(command, str):
+        command = ' '.join(command.split())
     
     if not all([source_vendor, target_vendor, command]):
         return jsonify({'error': 'Missing required parameters'}), 400
     
-    try:
-        translated = translator.translate(command, source_vendor, target_vendor)
-        return jsonify({
+    def compute():
+        # Suggestions are only computed, and only returned, on an exact-match miss
+        translated, suggestions = translator.translate_with_suggestions(
+            command, source_vendor, target_vendor, SUGGESTION_COUNT
+        )
+        result = {
             'source_command': command,
             'translated_command': translated
-        })
+        }
+        if suggestions is not None:
+            result['suggestions'] = [
+                {'source_command': source_cmd, 'target_command': target_cmd, 'score': score}
+                for source_cmd, target_cmd, score in suggestions
+            ]
+        return result
+    
+    try:
+        # Identical concurrent translations share one computation
+        return jsonify(coalescer.do(('translate', source_vendor, target_vendor, command), compute))
     except Exception as e:
         logger.error(f"Translation error: {str(e)}")
         return jsonify({'error': str(e)}), 400
@@ -328,18 +360,47 @@ def get_topics():
     ]
     return jsonify({'topics': topics})
 
+# Page sizes for the listing routes
+DEFAULT_PAGE_SIZE = 500
+DEFAULT_SUGGESTION_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 5000
+
+def parse_limit(default: int) -> int:
+    """Read the limit query parameter, clamped to MAX_PAGE_SIZE"""
+    limit = default
+    if 'limit' in request.args:
+        # Parse explicitly: type=int would silently fall back to the default
+        try:
+            limit = int(request.args['limit'])
+        except ValueError:
+            limit = 0
+    if limit < 1:
+        raise ValueError('limit must be a positive integer')
+    return min(limit, MAX_PAGE_SIZE)
+
 @app.route('/commands/<topic>')
 def get_commands_by_topic(topic):
     try:
-        logger.debug(f"Getting commands for topic: {topic}")
-        commands = db_manager.get_commands_by_topic(topic)
-        logger.debug(f"Found commands: {commands}")
+        limit = parse_limit(DEFAULT_PAGE_SIZE)
+        cursor = request.args.get('cursor', type=int)
+        if 'cursor' in request.args and cursor is None:
+            raise ValueError('cursor must be an integer')
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    try:
+        logger.debug(f"Getting commands for topic: {topic}, limit: {limit}, cursor: {cursor}")
+        # Identical concurrent topic queries share one database round trip
+        commands, next_cursor = coalescer.do(
+            ('commands', topic, limit, cursor),
+            lambda: db_manager.get_commands_by_topic_page(topic, limit, cursor)
+        )
         
         if not commands:
             logger.warning(f"No commands found for topic: {topic}")
-            return jsonify({'commands': {}})
+            return jsonify({'commands': {}, 'next_cursor': None})
             
-        return jsonify({'commands': commands})
+        return jsonify({'commands': commands, 'next_cursor': next_cursor})
     except Exception as e:
         logger.error(f"Error getting commands by topic: {str(e)}")
         return jsonify({'error': str(e)}), 400
@@ -348,26 +409,30 @@ def get_commands_by_topic(topic):
 def suggest_commands():
     vendor = request.args.get('vendor')
     term = request.args.get('term', '')
+    cursor = request.args.get('cursor')
     
     if not vendor:
         return jsonify({'error': 'Vendor parameter is required'}), 400
+
+    try:
+        limit = parse_limit(DEFAULT_SUGGESTION_PAGE_SIZE)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
     try:
         logger.debug(f"Getting suggestions for vendor: {vendor}, term: {term}")
-        # Get all commands for the vendor from the database
-        suggestions = db_manager.get_commands_by_vendor(vendor)
+        # Filtering by term and paging happen in the database
+        suggestions, next_cursor = db_manager.get_commands_by_vendor_page(vendor, limit, cursor, term)
         
-        # Filter suggestions based on the search term
-        filtered_suggestions = [
-            cmd for cmd in suggestions 
-            if term.lower() in cmd.lower()
-        ]
-        
-        logger.debug(f"Found suggestions: {filtered_suggestions}")
-        return jsonify({'suggestions': filtered_suggestions})
+        logger.debug(f"Found {len(suggestions)} suggestions")
+        return jsonify({'suggestions': suggestions, 'next_cursor': next_cursor})
     except Exception as e:
         logger.error(f"Error getting suggestions: {str(e)}")
         return jsonify({'error': str(e)}), 400
 
+@app.route('/metrics/coalescing')
+def coalescing_metrics():
+    return jsonify(coalescer.stats())
+
 if __name__ == '__main__':
     app.run(debug=True, port=5000) 
\ No newline at end of file
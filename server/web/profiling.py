@@ -0,0 +1,195 @@
+"""Opt-in per-request profiling for the Flask app.
+
+Profiling is configured through environment variables:
+
+    PROFILE_DIR          directory to write profiles to (required to enable profiling)
+    PROFILE_ADMIN_TOKEN  profile any request sending a matching X-Profile-Token header
+    PROFILE_SAMPLE_RATE  fraction of requests to profile at random (0.0 - 1.0)
+    PROFILE_FORMAT       "pstats" (cProfile, default) or "collapsed" (flamegraph stacks)
+
+When PROFILE_DIR is unset, or neither a token nor a sample rate is configured,
+no request hooks are registered at all, so unprofiled serving pays nothing.
+"""
+import cProfile
+import hmac
+import os
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from typing import Dict, List, Optional
+import logging
+
+from flask import Flask, g, request
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = 'X-Profile-Token'
+OUTPUT_HEADER = 'X-Profile-Output'
+FORMATS = ('pstats', 'collapsed')
+
+# cProfile on Python 3.12+ hooks the whole interpreter through sys.monitoring, so
+# only one request may hold an active cProfile.Profile at a time
+_cprofile_lock = threading.Lock()
+
+
+class StackProfiler:
+    """Records self time per call stack, written in collapsed-stack format.
+
+    The output has one "frame;frame;frame microseconds" line per stack and can
+    be fed directly to flamegraph.pl or speedscope.
+    """
+
+    def __init__(self):
+        self.stack: List[list] = []
+        self.samples: Dict[str, float] = {}
+
+    @staticmethod
+    def _frame_name(frame) -> str:
+        code = frame.f_code
+        return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+    @staticmethod
+    def _builtin_name(func) -> str:
+        module = getattr(func, '__module__', None)
+        name = getattr(func, '__qualname__', None) or repr(func)
+        return f"{module}.{name}" if module else name
+
+    def _callback(self, frame, event, arg) -> None:
+        now = time.perf_counter()
+        if event == 'call':
+            self.stack.append([self._frame_name(frame), now, 0.0])
+        elif event == 'c_call':
+            self.stack.append([self._builtin_name(arg), now, 0.0])
+        elif self.stack and event in ('return', 'c_return', 'c_exception'):
+            name, start, child_time = self.stack.pop()
+            elapsed = now - start
+            key = ';'.join([entry[0] for entry in self.stack] + [name])
+            self.samples[key] = self.samples.get(key, 0.0) + elapsed - child_time
+            if self.stack:
+                self.stack[-1][2] += elapsed
+
+    def enable(self) -> None:
+        sys.setprofile(self._callback)
+
+    def disable(self) -> None:
+        sys.setprofile(None)
+
+    def dump(self, path: str) -> None:
+        """Write collapsed stacks with self time in microseconds"""
+        with open(path, 'w') as f:
+            for stack, seconds in sorted(self.samples.items()):
+                micros = int(round(seconds * 1_000_000))
+                if micros > 0:
+                    f.write(f"{stack} {micros}\n")
+
+
+class RequestProfiler:
+    """Decides which requests to profile and writes their profiles to disk"""
+
+    def __init__(self,
+                 output_dir: str,
+                 admin_token: Optional[str] = None,
+                 sample_rate: float = 0.0,
+                 output_format: str = 'pstats'):
+        if output_format not in FORMATS:
+            raise ValueError(f"Unsupported profile format {output_format}, expected one of {FORMATS}")
+        if not 0.0 <= sample_rate <= 1.0:
+            raise ValueError("Profile sample rate must be between 0.0 and 1.0")
+        self.output_dir = output_dir
+        self.admin_token = admin_token
+        self.sample_rate = sample_rate
+        self.output_format = output_format
+        self._random = random.Random()
+        self._lock = threading.Lock()
+        os.makedirs(output_dir, exist_ok=True)
+
+    @classmethod
+    def from_env(cls) -> Optional['RequestProfiler']:
+        """Build a profiler from PROFILE_* environment variables, or None if disabled"""
+        output_dir = os.environ.get('PROFILE_DIR')
+        admin_token = os.environ.get('PROFILE_ADMIN_TOKEN') or None
+        sample_rate = float(os.environ.get('PROFILE_SAMPLE_RATE', '0') or 0)
+        if not output_dir or (not admin_token and sample_rate <= 0):
+            return None
+        return cls(output_dir,
+                   admin_token=admin_token,
+                   sample_rate=sample_rate,
+                   output_format=os.environ.get('PROFILE_FORMAT', 'pstats'))
+
+    def should_profile(self) -> bool:
+        """Profile when the admin header matches or the request is sampled"""
+        token = request.headers.get(PROFILE_HEADER)
+        if token and self.admin_token and hmac.compare_digest(token, self.admin_token):
+            return True
+        if self.sample_rate > 0:
+            with self._lock:
+                return self._random.random() < self.sample_rate
+        return False
+
+    def _output_path(self) -> str:
+        route = re.sub(r'[^A-Za-z0-9_.-]+', '_', request.path.strip('/')) or 'index'
+        extension = 'prof' if self.output_format == 'pstats' else 'folded'
+        name = f"{time.strftime('%Y%m%dT%H%M%S')}_{request.method}_{route}_{uuid.uuid4().hex[:8]}.{extension}"
+        return os.path.join(self.output_dir, name)
+
+    def before_request(self) -> None:
+        if not self.should_profile():
+            return
+        path = self._output_path()
+        if self.output_format == 'pstats':
+            # Skip rather than fail the request when another profile is running
+            if not _cprofile_lock.acquire(blocking=False):
+                logger.debug(f"Skipping profile of {request.path}: another request is being profiled")
+                return
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError as e:
+                _cprofile_lock.release()
+                logger.warning(f"Skipping profile of {request.path}: {str(e)}")
+                return
+        else:
+            # sys.setprofile is per-thread, so collapsed-stack profiles can overlap
+            profiler = StackProfiler()
+            profiler.enable()
+        g._request_profiler = profiler
+        g._request_profile_path = path
+
+    def after_request(self, response):
+        if getattr(g, '_request_profiler', None) is not None:
+            response.headers[OUTPUT_HEADER] = os.path.basename(g._request_profile_path)
+        return response
+
+    def teardown_request(self, exc) -> None:
+        profiler = g.pop('_request_profiler', None)
+        if profiler is None:
+            return
+        try:
+            profiler.disable()
+        finally:
+            if isinstance(profiler, cProfile.Profile):
+                _cprofile_lock.release()
+        path = g.pop('_request_profile_path')
+        try:
+            if isinstance(profiler, cProfile.Profile):
+                profiler.dump_stats(path)
+            else:
+                profiler.dump(path)
+            logger.info(f"Wrote request profile for {request.method} {request.path} to {path}")
+        except Exception as e:
+            logger.error(f"Error writing request profile: {str(e)}")
+
+
+def init_profiling(app: Flask, profiler: Optional[RequestProfiler] = None) -> Optional[RequestProfiler]:
+    """Register profiling hooks on the app if profiling is configured"""
+    profiler = profiler or RequestProfiler.from_env()
+    if profiler is None:
+        return None
+    app.before_request(profiler.before_request)
+    app.after_request(profiler.after_request)
+    app.teardown_request(profiler.teardown_request)
+    logger.info(f"Request profiling enabled, writing {profiler.output_format} output to {profiler.output_dir}")
+    return profiler
@@ -0,0 +1,135 @@
+"""Single-flight coalescing for identical concurrent requests.
+
+Concurrent calls with the same key share one in-flight computation: the first
+caller runs it and every caller that arrives before it finishes receives the
+same result (or exception). Results are not cached once the call completes.
+"""
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class _Call:
+    """A computation in flight in a worker thread"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException = None
+        self.waiters = 0
+
+
+class _AsyncCall:
+    """A computation in flight as a task on an event loop"""
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.callers = 0
+
+
+class SingleFlight:
+    """Coalesces identical concurrent calls in threaded and asyncio code.
+
+    Threaded callers use do(); coroutines use do_async(). Async calls are
+    coalesced per event loop, since futures cannot be shared across loops.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._async_calls: Dict[Tuple[asyncio.AbstractEventLoop, Hashable], _AsyncCall] = {}
+        self._calls_total = 0
+        self._executions = 0
+        self._coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """Run fn, or wait for an identical call already running in another thread"""
+        with self._lock:
+            self._calls_total += 1
+            call = self._calls.get(key)
+            if call is not None:
+                self._coalesced += 1
+                call.waiters += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self._executions += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            if call.waiters:
+                logger.debug(f"Coalesced {call.waiters} calls for {key}")
+            call.done.set()
+
+    async def do_async(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Await fn(), or an identical call already running on this event loop.
+
+        The computation runs as a shared task that every caller awaits through
+        a shield, so cancelling one caller never cancels the others. The task
+        is only cancelled once every caller waiting on it has been cancelled.
+        """
+        loop = asyncio.get_running_loop()
+        flight_key = (loop, key)
+        with self._lock:
+            self._calls_total += 1
+            call = self._async_calls.get(flight_key)
+            if call is not None:
+                self._coalesced += 1
+            else:
+                call = _AsyncCall(loop.create_task(fn()))
+                self._async_calls[flight_key] = call
+                self._executions += 1
+                call.task.add_done_callback(lambda task: self._finish_async(flight_key, call))
+            call.callers += 1
+
+        try:
+            return await asyncio.shield(call.task)
+        except asyncio.CancelledError:
+            if not call.task.done():
+                with self._lock:
+                    call.callers -= 1
+                    abandoned = call.callers == 0
+                    if abandoned and self._async_calls.get(flight_key) is call:
+                        # Unregister first so a caller arriving now starts a fresh task
+                        del self._async_calls[flight_key]
+                if abandoned:
+                    call.task.cancel()
+            raise
+
+    def _finish_async(self, flight_key: Tuple[asyncio.AbstractEventLoop, Hashable], call: '_AsyncCall') -> None:
+        with self._lock:
+            if self._async_calls.get(flight_key) is call:
+                del self._async_calls[flight_key]
+        if not call.task.cancelled():
+            # Mark the exception as retrieved in case every caller was cancelled
+            call.task.exception()
+        if call.callers > 1:
+            logger.debug(f"Coalesced {call.callers - 1} async calls for {flight_key[1]}")
+
+    def stats(self) -> Dict[str, int]:
+        """Counts of calls received, computations executed and calls coalesced"""
+        with self._lock:
+            return {
+                'calls': self._calls_total,
+                'executions': self._executions,
+                'coalesced': self._coalesced,
+                'in_flight': len(self._calls) + len(self._async_calls),
+            }
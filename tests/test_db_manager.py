@@ -0,0 +1,36 @@
+import os
+import tempfile
+import unittest
+
+from server.database.db_manager import DatabaseManager
+
+
+class MappingListenerTest(unittest.TestCase):
+    def setUp(self):
+        handle, self.db_path = tempfile.mkstemp(suffix='.db')
+        os.close(handle)
+        self.db_manager = DatabaseManager(self.db_path)
+
+    def tearDown(self):
+        os.remove(self.db_path)
+
+    def test_failing_listener_does_not_fail_the_write(self):
+        notified = []
+
+        def failing_listener(*mapping):
+            raise RuntimeError('index broken')
+
+        self.db_manager.add_mapping_listener(failing_listener)
+        self.db_manager.add_mapping_listener(lambda *mapping: notified.append(mapping))
+
+        self.db_manager.add_command_mapping('Huawei', 'Cisco', 'display bgp peer', 'show ip bgp summary', 'BGP')
+
+        self.assertEqual(
+            self.db_manager.get_command_mapping('Huawei', 'Cisco', 'display bgp peer'),
+            'show ip bgp summary'
+        )
+        self.assertEqual(notified, [('Huawei', 'Cisco', 'display bgp peer', 'show ip bgp summary')])
+
+
+if __name__ == '__main__':
+    unittest.main()
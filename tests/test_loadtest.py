@@ -0,0 +1,41 @@
+import unittest
+
+from server.loadtest import LoadRunner, RequestSpec, percentile
+
+
+class PercentileTest(unittest.TestCase):
+    def test_nearest_rank(self):
+        values = list(range(1, 101))
+        self.assertEqual([percentile(values, p) for p in (50, 95, 99, 100)], [50, 95, 99, 100])
+        values = list(range(1, 11))
+        self.assertEqual([percentile(values, p) for p in (50, 95)], [5, 10])
+        self.assertIsNone(percentile([], 50))
+
+
+class RecordingRunner(LoadRunner):
+    """Records dispatch order instead of sending requests"""
+
+    def __init__(self, **kwargs):
+        super().__init__('http://127.0.0.1:1', **kwargs)
+        self.sent = []
+
+    def _send(self, spec, scheduled=None):
+        self.sent.append(spec.path)
+        self.stats.record(spec.route, 0.0, 200, False)
+
+
+class ReplayTest(unittest.TestCase):
+    def test_unsorted_log_is_dispatched_in_offset_order(self):
+        runner = RecordingRunner(concurrency=1)
+        specs = [
+            RequestSpec('late', 'GET', '/late', offset=0.2),
+            RequestSpec('early', 'GET', '/early', offset=0.0),
+            RequestSpec('middle', 'GET', '/middle', offset=0.1),
+        ]
+        report = runner.run_replay(specs)
+        self.assertEqual(runner.sent, ['/early', '/middle', '/late'])
+        self.assertEqual(report['requests'], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+import asyncio
+import threading
+import time
+import unittest
+
+from server.web.singleflight import SingleFlight
+
+
+class SingleFlightThreadedTest(unittest.TestCase):
+    def test_concurrent_calls_share_one_execution(self):
+        flight = SingleFlight()
+        runs = []
+        results = []
+        started = threading.Event()
+
+        def compute():
+            runs.append(1)
+            started.set()
+            time.sleep(0.2)
+            return {'value': 1}
+
+        def worker():
+            results.append(flight.do('key', compute))
+
+        leader = threading.Thread(target=worker)
+        leader.start()
+        started.wait()
+        followers = [threading.Thread(target=worker) for _ in range(9)]
+        for thread in followers:
+            thread.start()
+        for thread in [leader] + followers:
+            thread.join()
+
+        self.assertEqual(len(runs), 1)
+        self.assertEqual(len(results), 10)
+        self.assertTrue(all(result is results[0] for result in results))
+        self.assertEqual(flight.stats(), {'calls': 10, 'executions': 1, 'coalesced': 9, 'in_flight': 0})
+
+    def test_exception_reaches_every_caller(self):
+        flight = SingleFlight()
+        errors = []
+        started = threading.Event()
+
+        def compute():
+            started.set()
+            time.sleep(0.1)
+            raise ValueError('boom')
+
+        def worker():
+            try:
+                flight.do('key', compute)
+            except ValueError as e:
+                errors.append(str(e))
+
+        leader = threading.Thread(target=worker)
+        leader.start()
+        started.wait()
+        followers = [threading.Thread(target=worker) for _ in range(3)]
+        for thread in followers:
+            thread.start()
+        for thread in [leader] + followers:
+            thread.join()
+
+        self.assertEqual(errors, ['boom'] * 4)
+        self.assertEqual(flight.stats()['executions'], 1)
+
+
+class SingleFlightAsyncTest(unittest.TestCase):
+    def test_concurrent_calls_share_one_execution(self):
+        async def scenario():
+            flight = SingleFlight()
+            runs = []
+
+            async def compute():
+                runs.append(1)
+                await asyncio.sleep(0.05)
+                return 42
+
+            results = await asyncio.gather(*[flight.do_async('key', compute) for _ in range(10)])
+            return runs, results, flight.stats()
+
+        runs, results, stats = asyncio.run(scenario())
+        self.assertEqual(len(runs), 1)
+        self.assertEqual(results, [42] * 10)
+        self.assertEqual(stats, {'calls': 10, 'executions': 1, 'coalesced': 9, 'in_flight': 0})
+
+    def test_cancelled_leader_does_not_cancel_waiters(self):
+        async def scenario():
+            flight = SingleFlight()
+
+            async def compute():
+                await asyncio.sleep(0.05)
+                return 7
+
+            leader = asyncio.create_task(flight.do_async('key', compute))
+            await asyncio.sleep(0)
+            waiter = asyncio.create_task(flight.do_async('key', compute))
+            await asyncio.sleep(0.01)
+            leader.cancel()
+            result = await waiter
+            return leader.cancelled(), result, flight.stats()
+
+        leader_cancelled, result, stats = asyncio.run(scenario())
+        self.assertTrue(leader_cancelled)
+        self.assertEqual(result, 7)
+        self.assertEqual(stats['executions'], 1)
+
+    def test_caller_after_last_cancel_starts_fresh_task(self):
+        async def scenario():
+            flight = SingleFlight()
+            runs = []
+
+            async def compute():
+                runs.append(1)
+                await asyncio.sleep(0.05)
+                return 'done'
+
+            first = asyncio.create_task(flight.do_async('key', compute))
+            await asyncio.sleep(0.01)
+            first.cancel()
+            # Join immediately, before the cancelled task has finished unwinding
+            second = asyncio.create_task(flight.do_async('key', compute))
+            results = await asyncio.gather(first, second, return_exceptions=True)
+            return runs, results, flight.stats()
+
+        runs, results, stats = asyncio.run(scenario())
+        self.assertIsInstance(results[0], asyncio.CancelledError)
+        self.assertEqual(results[1], 'done')
+        self.assertEqual(len(runs), 2)
+        self.assertEqual(stats['in_flight'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()